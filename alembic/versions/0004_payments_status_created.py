@@ -0,0 +1,92 @@
+"""add payments list indexes, drop redundant status index
+
+Revision ID: 0004_payments_status_created
+Revises: 0003_promo_curr_act_not_null
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op, context
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_payments_status_created"
+down_revision: Union[str, Sequence[str], None] = "0003_promo_curr_act_not_null"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_STATUS_CREATED_INDEX = "ix_payments_status_created_at"
+_USER_SUCCEEDED_INDEX = "ix_payments_user_succeeded"
+# Single-column status index from 0001; its leading column is covered by
+# _STATUS_CREATED_INDEX, so keeping it only adds write cost.
+_LEGACY_STATUS_INDEX = "ix_payments_status"
+
+
+def _create_status_created_index() -> None:
+    # Serves the admin payments list ("WHERE status = ... AND (created_at,
+    # payment_id) < cursor ORDER BY created_at DESC, payment_id DESC") as a
+    # pure index range scan; payment_id is the keyset tiebreaker.
+    op.create_index(
+        _STATUS_CREATED_INDEX,
+        "payments",
+        ["status", sa.text("created_at DESC"), sa.text("payment_id DESC")],
+        unique=False,
+    )
+
+
+def _create_user_succeeded_index() -> None:
+    # Partial index for per-user succeeded payment lookups (referral stats,
+    # one-bonus-per-referee checks).
+    op.create_index(
+        _USER_SUCCEEDED_INDEX,
+        "payments",
+        ["user_id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'succeeded'"),
+    )
+
+
+def upgrade() -> None:
+    if context.is_offline_mode():
+        _create_status_created_index()
+        _create_user_succeeded_index()
+        op.drop_index(_LEGACY_STATUS_INDEX, table_name="payments")
+        return
+
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("payments"):
+        return
+
+    indexes = {index["name"] for index in inspector.get_indexes("payments")}
+    if _STATUS_CREATED_INDEX not in indexes:
+        _create_status_created_index()
+    if _USER_SUCCEEDED_INDEX not in indexes:
+        _create_user_succeeded_index()
+    if _LEGACY_STATUS_INDEX in indexes:
+        op.drop_index(_LEGACY_STATUS_INDEX, table_name="payments")
+
+
+def downgrade() -> None:
+    if context.is_offline_mode():
+        op.create_index(_LEGACY_STATUS_INDEX, "payments", ["status"], unique=False)
+        op.drop_index(_USER_SUCCEEDED_INDEX, table_name="payments")
+        op.drop_index(_STATUS_CREATED_INDEX, table_name="payments")
+        return
+
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("payments"):
+        return
+
+    indexes = {index["name"] for index in inspector.get_indexes("payments")}
+    if _LEGACY_STATUS_INDEX not in indexes:
+        op.create_index(_LEGACY_STATUS_INDEX, "payments", ["status"], unique=False)
+    if _USER_SUCCEEDED_INDEX in indexes:
+        op.drop_index(_USER_SUCCEEDED_INDEX, table_name="payments")
+    if _STATUS_CREATED_INDEX in indexes:
+        op.drop_index(_STATUS_CREATED_INDEX, table_name="payments")
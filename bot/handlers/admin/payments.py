@@ -1,15 +1,18 @@
 import logging
 import csv
 import io
+from functools import partial
 from aiogram import Router, F, types
 from aiogram.filters import StateFilter
+from aiogram.filters.callback_data import CallbackData
 from aiogram.fsm.context import FSMContext
 from datetime import datetime, timedelta, timezone
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.settings import Settings
 from db.dal import payment_dal
+from db.dal.payment_dal import PaymentLogRow
 from db.models import Payment
 from bot.keyboards.inline.admin_keyboards import get_back_to_admin_panel_keyboard
 from aiogram.utils.keyboard import InlineKeyboardBuilder, InlineKeyboardButton
@@ -17,55 +20,96 @@ from bot.middlewares.i18n import JsonI18n
 
 router = Router(name="admin_payments_router")
 
+_PAYMENT_STATUS_EMOJI = {
+    'succeeded': "✅",
+    'pending': "⏳",
+    'pending_yookassa': "⏳",
+    'pending_freekassa': "⏳",
+    'pending_platega': "⏳",
+    'pending_severpay': "⏳",
+    'pending_cryptopay': "⏳",
+}
 
-async def get_payments_with_pagination(session: AsyncSession, page: int = 0, 
-                                     page_size: int = 10) -> tuple[List[Payment], int]:
-    """Get payments with pagination and total count."""
-    offset = page * page_size
-    
-    # Get total count
-    total_count = await payment_dal.get_payments_count(session)
-    
-    # Get payments for current page
-    payments = await payment_dal.get_recent_payment_logs_with_user(
-        session, limit=page_size, offset=offset
+_PROVIDER_DISPLAY_NAMES = {
+    'yookassa': 'YooKassa',
+    'telegram_stars': 'Telegram Stars',
+    'cryptopay': 'CryptoPay',
+    'freekassa': 'FreeKassa',
+    'severpay': 'SeverPay',
+    'platega': 'Platega',
+}
+
+
+_CURSOR_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+_PAGE_DIRECTIONS = {"n": "next", "p": "prev", "c": "current"}
+
+
+class PaymentsPageCB(CallbackData, prefix="payments_page"):
+    """Keyset page of the payments list.
+
+    ``direction`` is "n"/"p"/"c" (next/prev/current) relative to the
+    (created_us, payment_id) cursor; without a cursor the newest page is shown.
+    """
+    page: int
+    direction: str = "n"
+    created_us: Optional[int] = None
+    payment_id: Optional[int] = None
+
+
+def _payments_page_cb(page: int, direction: str, payment: Payment) -> str:
+    """Pack a page button anchored at the given payment."""
+    created_us = (payment.created_at - _CURSOR_EPOCH) // timedelta(microseconds=1)
+    return PaymentsPageCB(page=page,
+                          direction=direction,
+                          created_us=created_us,
+                          payment_id=payment.payment_id).pack()
+
+
+def _payments_static_buttons(i18n: JsonI18n, lang: str) -> Tuple[InlineKeyboardButton, InlineKeyboardButton]:
+    """Export and back buttons of the payments list.
+
+    Labels come from the i18n lookup cache (cleared on locale reload); the
+    buttons themselves are mutable, so each render gets fresh instances.
+    """
+    export_button = InlineKeyboardButton(
+        text=i18n.fast_gettext(lang, "admin_export_payments_csv"),
+        callback_data="payments_export_csv"
     )
-    
-    return payments, total_count
+    back_button = InlineKeyboardButton(
+        text=i18n.fast_gettext(lang, "back_to_admin_panel_button"),
+        callback_data="admin_section:stats_monitoring"
+    )
+    return export_button, back_button
 
 
-def format_payment_text(payment: Payment, i18n: JsonI18n, lang: str, settings: Settings) -> str:
+async def get_payments_with_pagination(session: AsyncSession, page_size: int = 10,
+                                       cursor: Optional[Tuple[datetime, int]] = None,
+                                       direction: str = "next") -> tuple[List[PaymentLogRow], int]:
+    """Get a keyset page of payments and total count."""
+    return await payment_dal.get_payment_logs_page_keyset(
+        session, limit=page_size, cursor=cursor, direction=direction
+    )
+
+
+def format_payment_text(row: PaymentLogRow, i18n: JsonI18n, lang: str, settings: Settings) -> str:
     """Format single payment info as text."""
-    _ = lambda key, **kwargs: i18n.gettext(lang, key, **kwargs)
+    payment = row.payment
+    _ = partial(i18n.fast_gettext, lang)
     
-    pending_statuses = [
-        'pending',
-        'pending_yookassa',
-        'pending_freekassa',
-        'pending_platega',
-        'pending_severpay',
-        'pending_cryptopay',
-    ]
-    status_emoji = "✅" if payment.status == 'succeeded' else (
-        "⏳" if payment.status in pending_statuses else "❌"
-    )
+    status_emoji = _PAYMENT_STATUS_EMOJI.get(payment.status, "❌")
     
-    user_info = f"User {payment.user_id}"
-    if payment.user and payment.user.username:
-        user_info += f" (@{payment.user.username})"
-    elif payment.user and payment.user.first_name:
-        user_info += f" ({payment.user.first_name})"
+    username = row.username
+    if username:
+        user_info = f"User {payment.user_id} (@{username})"
+    elif row.first_name:
+        user_info = f"User {payment.user_id} ({row.first_name})"
+    else:
+        user_info = f"User {payment.user_id}"
     
     payment_date = payment.created_at.strftime('%Y-%m-%d %H:%M') if payment.created_at else "N/A"
     
-    provider_text = {
-        'yookassa': 'YooKassa',
-        'telegram_stars': 'Telegram Stars',
-        'cryptopay': 'CryptoPay',
-        'freekassa': 'FreeKassa',
-        'severpay': 'SeverPay',
-        'platega': 'Platega',
-    }.get(payment.provider, payment.provider or 'Unknown')
+    provider_text = _PROVIDER_DISPLAY_NAMES.get(payment.provider, payment.provider or 'Unknown')
 
     traffic_mode = getattr(settings, "traffic_sale_mode", False)
     if traffic_mode:
@@ -75,29 +119,40 @@ def format_payment_text(payment: Payment, i18n: JsonI18n, lang: str, settings: S
     else:
         period_line = _("admin_payment_months_label", months=payment.subscription_duration_months or 0)
     
-    return (
-        f"{status_emoji} <b>{payment.amount} {payment.currency}</b>\n"
-        f"👤 {user_info}\n"
-        f"💳 {provider_text}\n"
-        f"📅 {payment_date}\n"
-        f"{period_line}\n"
-        f"📋 {payment.status}\n"
-        f"📝 {payment.description or 'N/A'}"
-    )
+    return "\n".join((
+        f"{status_emoji} <b>{payment.amount} {payment.currency}</b>",
+        f"👤 {user_info}",
+        f"💳 {provider_text}",
+        f"📅 {payment_date}",
+        period_line,
+        f"📋 {payment.status}",
+        f"📝 {payment.description or 'N/A'}",
+    ))
 
 
 async def view_payments_handler(callback: types.CallbackQuery, i18n_data: dict, 
-                              settings: Settings, session: AsyncSession, page: int = 0):
-    """Display paginated list of all payments."""
+                              settings: Settings, session: AsyncSession, page: int = 0,
+                              cursor: Optional[Tuple[datetime, int]] = None,
+                              direction: str = "next"):
+    """Display paginated list of all payments.
+
+    Pages are addressed by a (created_at, payment_id) cursor carried in the
+    callback data; ``page`` is only used for numbering.
+    """
     current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
     i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
     if not i18n or not callback.message:
         await callback.answer("Error processing request.", show_alert=True)
         return
-    _ = lambda key, **kwargs: i18n.gettext(current_lang, key, **kwargs)
+    _ = partial(i18n.fast_gettext, current_lang)
 
     page_size = 5  # Show 5 payments per page
-    payments, total_count = await get_payments_with_pagination(session, page, page_size)
+    payments, total_count = await get_payments_with_pagination(
+        session, page_size, cursor, direction)
+    if not payments and cursor is not None:
+        # Cursor ran past the data (e.g. rows removed) - restart from the top
+        page, cursor = 0, None
+        payments, total_count = await get_payments_with_pagination(session, page_size)
     total_pages = (total_count + page_size - 1) // page_size if total_count > 0 else 1
 
     if not payments and page == 0:
@@ -110,16 +165,19 @@ async def view_payments_handler(callback: types.CallbackQuery, i18n_data: dict,
         return
 
     # Format payments text
-    text_parts = [_("admin_payments_header")]
-    text_parts.append(_("admin_payments_pagination_info", 
-                       shown=len(payments), 
-                       total=total_count, 
-                       current_page=page + 1, 
-                       total_pages=total_pages) + "\n")
+    buf = io.StringIO()
+    buf.write(_("admin_payments_header"))
+    buf.write("\n")
+    buf.write(_("admin_payments_pagination_info", 
+                shown=len(payments), 
+                total=total_count, 
+                current_page=page + 1, 
+                total_pages=total_pages))
+    buf.write("\n\n")
     
-    for i, payment in enumerate(payments, 1):
-        text_parts.append(f"<b>{page * page_size + i}.</b> {format_payment_text(payment, i18n, current_lang, settings)}")
-        text_parts.append("")  # Empty line between payments
+    for i, payment in enumerate(payments, page * page_size + 1):
+        buf.write(f"<b>{i}.</b> {format_payment_text(payment, i18n, current_lang, settings)}")
+        buf.write("\n\n")  # Empty line between payments
 
     # Build keyboard with pagination and export
     builder = InlineKeyboardBuilder()
@@ -127,51 +185,56 @@ async def view_payments_handler(callback: types.CallbackQuery, i18n_data: dict,
     # Pagination buttons
     nav_buttons = []
     if page > 0:
-        nav_buttons.append(InlineKeyboardButton(text="⬅️", callback_data=f"payments_page:{page-1}"))
+        nav_buttons.append(InlineKeyboardButton(text="⬅️", callback_data=_payments_page_cb(page - 1, "p", payments[0].payment)))
     
     nav_buttons.append(InlineKeyboardButton(text=f"{page + 1}/{total_pages}", callback_data="noop"))
     
     if page < total_pages - 1:
-        nav_buttons.append(InlineKeyboardButton(text="➡️", callback_data=f"payments_page:{page+1}"))
+        nav_buttons.append(InlineKeyboardButton(text="➡️", callback_data=_payments_page_cb(page + 1, "n", payments[-1].payment)))
     
     if nav_buttons:
         builder.row(*nav_buttons)
     
+    export_button, back_button = _payments_static_buttons(i18n, current_lang)
+
     # Export and refresh buttons
     builder.row(
-        InlineKeyboardButton(
-            text=_("admin_export_payments_csv"), 
-            callback_data="payments_export_csv"
-        ),
+        export_button,
         InlineKeyboardButton(
             text=_("admin_refresh_payments"), 
-            callback_data=f"payments_page:{page}"
+            callback_data=_payments_page_cb(page, "c", payments[0].payment)
         )
     )
     
     # Back button
-    builder.row(InlineKeyboardButton(
-        text=_("back_to_admin_panel_button"), 
-        callback_data="admin_section:stats_monitoring"
-    ))
+    builder.row(back_button)
 
     await callback.message.edit_text(
-        "\n".join(text_parts),
+        buf.getvalue(),
         reply_markup=builder.as_markup(),
         parse_mode="HTML"
     )
     await callback.answer()
 
 
-@router.callback_query(F.data.startswith("payments_page:"))
-async def payments_pagination_handler(callback: types.CallbackQuery, i18n_data: dict, 
-                                    settings: Settings, session: AsyncSession):
+@router.callback_query(PaymentsPageCB.filter())
+async def payments_pagination_handler(callback: types.CallbackQuery, callback_data: PaymentsPageCB,
+                                    i18n_data: dict, settings: Settings, session: AsyncSession):
     """Handle pagination for payments list."""
-    try:
-        page = int(callback.data.split(":")[1])
-        await view_payments_handler(callback, i18n_data, settings, session, page)
-    except (ValueError, IndexError):
-        await callback.answer("Error processing pagination.", show_alert=True)
+    cursor = None
+    if callback_data.created_us is not None and callback_data.payment_id is not None:
+        cursor = (_CURSOR_EPOCH + timedelta(microseconds=callback_data.created_us),
+                  callback_data.payment_id)
+    direction = _PAGE_DIRECTIONS.get(callback_data.direction, "next")
+    await view_payments_handler(callback, i18n_data, settings, session,
+                                callback_data.page if cursor else 0, cursor, direction)
+
+
+@router.callback_query(F.data.startswith("payments_page:"))
+async def legacy_payments_pagination_handler(callback: types.CallbackQuery, i18n_data: dict,
+                                           settings: Settings, session: AsyncSession):
+    """Buttons sent before keyset pagination carry only a page number: show the newest page."""
+    await view_payments_handler(callback, i18n_data, settings, session)
 
 
 @router.callback_query(F.data == "payments_export_csv")
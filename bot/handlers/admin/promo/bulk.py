@@ -335,47 +335,54 @@ async def create_bulk_promo_codes_final(callback_or_message,
         # Generate and create promo codes
         created_codes = []
         failed_codes = []
-        
-        for i in range(quantity):
-            try:
-                # Generate unique code
-                attempts = 0
-                while attempts < 10:  # Max 10 attempts to generate unique code
-                    promo_code = generate_unique_promo_code()
-                    existing_promo = await promo_code_dal.get_promo_code_by_code(session, promo_code)
-                    if not existing_promo:
-                        break
-                    attempts += 1
-                
-                if attempts >= 10:
-                    failed_codes.append(f"Код #{i+1} (не удалось сгенерировать уникальный)")
-                    continue
-                
-                # Prepare promo code data
-                promo_data = {
-                    "code": promo_code,
-                    "bonus_days": data["bonus_days"],
-                    "max_activations": data["max_activations"],
-                    "current_activations": 0,
-                    "is_active": True,
-                    "created_by_admin_id": callback_or_message.from_user.id,
-                    "created_at": datetime.now(timezone.utc)
-                }
-                
-                # Set validity
-                if data.get("validity_days"):
-                    promo_data["valid_until"] = datetime.now(timezone.utc) + timedelta(days=data["validity_days"])
-                else:
-                    promo_data["valid_until"] = None
-                
-                # Create promo code
-                created_promo = await promo_code_dal.create_promo_code(session, promo_data)
-                created_codes.append(created_promo.code)
-                
-            except Exception as e:
-                logging.error(f"Error creating bulk promo code #{i+1}: {e}")
-                failed_codes.append(f"Код #{i+1} ({str(e)[:50]})")
-        
+
+        # Resolve collisions for the whole batch per attempt instead of
+        # querying every candidate code separately
+        codes: list[str] = []
+        pending = quantity
+        attempts = 0
+        while pending and attempts < 10:  # Max 10 attempts to generate unique codes
+            candidates = {generate_unique_promo_code() for _i in range(pending)}
+            candidates.difference_update(codes)
+            existing = await promo_code_dal.get_existing_promo_codes(
+                session, list(candidates))
+            fresh = [code for code in candidates if code not in existing]
+            codes.extend(fresh)
+            pending -= len(fresh)
+            attempts += 1
+
+        for i in range(len(codes), quantity):
+            failed_codes.append(f"Код #{i+1} (не удалось сгенерировать уникальный)")
+
+        now_utc = datetime.now(timezone.utc)
+        if data.get("validity_days"):
+            valid_until = now_utc + timedelta(days=data["validity_days"])
+        else:
+            valid_until = None
+
+        promo_payloads = [
+            {
+                "code": code,
+                "bonus_days": data["bonus_days"],
+                "max_activations": data["max_activations"],
+                "current_activations": 0,
+                "is_active": True,
+                "created_by_admin_id": callback_or_message.from_user.id,
+                "created_at": now_utc,
+                "valid_until": valid_until,
+            }
+            for code in codes
+        ]
+
+        try:
+            created_codes = await promo_code_dal.bulk_create_promo_codes(
+                session, promo_payloads)
+        except Exception as e:
+            logging.error(f"Error bulk-creating {len(promo_payloads)} promo codes: {e}")
+            await session.rollback()
+            failed_codes.extend(
+                f"Код #{i+1} ({str(e)[:50]})" for i in range(len(promo_payloads)))
+
         await session.commit()
         
         # Success message
@@ -7,6 +7,7 @@ from aiogram.fsm.context import FSMContext
 from datetime import datetime, timedelta, timezone
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
 
 from config.settings import Settings, get_settings
 from db.dal import promo_code_dal
@@ -15,22 +16,27 @@ from bot.states.admin_states import AdminStates
 from bot.keyboards.inline.admin_keyboards import get_back_to_admin_panel_keyboard, get_admin_panel_keyboard
 from aiogram.utils.keyboard import InlineKeyboardBuilder, InlineKeyboardButton
 from bot.middlewares.i18n import JsonI18n
+from bot.utils.telegram_retry import schedule_safe_send
 
 router = Router(name="promo_manage_router")
 
 
-def get_promo_status_emoji_and_text(promo: PromoCode, i18n: JsonI18n, current_lang: str):
-    """Determine promo code status and return emoji + text"""
-    _ = lambda key, **kwargs: i18n.gettext(current_lang, key, **kwargs)
-    
-    if promo.valid_until and promo.valid_until < datetime.now(timezone.utc):
-        return "⏰", _("admin_promo_status_expired")
+def _get_promo_status(promo: PromoCode, now: datetime):
+    """Determine promo code status and return emoji + i18n key"""
+    if promo.valid_until and promo.valid_until < now:
+        return "⏰", "admin_promo_status_expired"
     elif promo.current_activations >= promo.max_activations:
-        return "🔄", _("admin_promo_status_used_up")
+        return "🔄", "admin_promo_status_used_up"
     elif promo.is_active:
-        return "✅", _("admin_promo_status_active")
+        return "✅", "admin_promo_status_active"
     else:
-        return "🚫", _("admin_promo_status_inactive")
+        return "🚫", "admin_promo_status_inactive"
+
+
+def get_promo_status_emoji_and_text(promo: PromoCode, i18n: JsonI18n, current_lang: str):
+    """Determine promo code status and return emoji + text"""
+    status_emoji, status_key = _get_promo_status(promo, datetime.now(timezone.utc))
+    return status_emoji, i18n.gettext(current_lang, status_key)
 
 
 async def get_promo_detail_text_and_keyboard(promo_id: int, session: AsyncSession, i18n: JsonI18n, current_lang: str):
@@ -90,14 +96,17 @@ async def view_promo_codes_handler(callback: types.CallbackQuery, i18n_data: dic
         text = f"{_('admin_active_promos_list_header')}\n\n{_('admin_no_active_promos')}"
     else:
         promo_lines = [_("admin_active_promos_list_header"), ""]
+        # Per-row invariants: only the emoji is shown, so no status text lookup
+        now_utc = datetime.now(timezone.utc)
+        indefinitely_label = _('admin_promo_valid_indefinitely')
         for p in promo_models:
-            status_emoji = get_promo_status_emoji_and_text(p, i18n, current_lang)[0]
+            status_emoji = _get_promo_status(p, now_utc)[0]
             promo_type = getattr(p, "promo_type", "bonus_days")
             if promo_type == "discount":
                 value_display = f"💰 {p.discount_percentage}%"
             else:
                 value_display = f"🎁 {p.bonus_days}д"
-            validity_display = p.valid_until.strftime('%d.%m.%Y') if p.valid_until else _('admin_promo_valid_indefinitely')
+            validity_display = p.valid_until.strftime('%d.%m.%Y') if p.valid_until else indefinitely_label
             promo_lines.append(
                 f"{status_emoji} <code>{p.code}</code> | {value_display} | 📊 {p.current_activations}/{p.max_activations} | ⏰ {validity_display}"
             )
@@ -129,8 +138,9 @@ async def promo_management_handler(callback: types.CallbackQuery, i18n_data: dic
         return
 
     builder = InlineKeyboardBuilder()
+    now_utc = datetime.now(timezone.utc)
     for promo in promo_models:
-        status_emoji, status_text = get_promo_status_emoji_and_text(promo, i18n, current_lang)
+        status_emoji = _get_promo_status(promo, now_utc)[0]
         button_text = f"{status_emoji} {promo.code} ({promo.current_activations}/{promo.max_activations})"
         builder.row(InlineKeyboardButton(text=button_text, callback_data=f"promo_detail:{promo.promo_code_id}"))
     
@@ -332,9 +342,19 @@ async def promo_export_all_handler(callback: types.CallbackQuery, i18n_data: dic
             i18n.gettext(export_lang, "admin_promo_csv_created_by_admin_id"),
         ])
 
+        # Labels are identical for every row; translate them once
+        now_utc = datetime.now(timezone.utc)
+        status_labels = {}
+        yes_label = i18n.gettext(export_lang, "csv_yes")
+        no_label = i18n.gettext(export_lang, "csv_no")
+        indefinitely_label = i18n.gettext(export_lang, "admin_promo_valid_indefinitely")
+
         for promo in all_promos:
             # Определяем статус
-            status_emoji, status_text = get_promo_status_emoji_and_text(promo, i18n, export_lang)
+            status_key = _get_promo_status(promo, now_utc)[1]
+            status_text = status_labels.get(status_key)
+            if status_text is None:
+                status_text = status_labels[status_key] = i18n.gettext(export_lang, status_key)
 
             # Determine promo type and values
             promo_type = getattr(promo, "promo_type", "bonus_days")
@@ -350,8 +370,8 @@ async def promo_export_all_handler(callback: types.CallbackQuery, i18n_data: dic
                 promo.max_activations,
                 promo.current_activations,
                 status_text,
-                i18n.gettext(export_lang, "csv_yes") if promo.is_active else i18n.gettext(export_lang, "csv_no"),
-                promo.valid_until.strftime("%Y-%m-%d %H:%M:%S") if promo.valid_until else i18n.gettext(export_lang, "admin_promo_valid_indefinitely"),
+                yes_label if promo.is_active else no_label,
+                promo.valid_until.strftime("%Y-%m-%d %H:%M:%S") if promo.valid_until else indefinitely_label,
                 promo.created_at.strftime("%Y-%m-%d %H:%M:%S") if promo.created_at else "N/A",
                 promo.created_by_admin_id or "N/A"
             ]
@@ -373,8 +393,15 @@ async def promo_export_all_handler(callback: types.CallbackQuery, i18n_data: dic
         await callback.answer(f"❌ Export error: {str(e)}", show_alert=True)
 
 
+async def _refresh_promo_management(callback: types.CallbackQuery, i18n_data: dict, settings: Settings,
+                                    async_session_factory: sessionmaker):
+    async with async_session_factory() as session:
+        await promo_management_handler(callback, i18n_data, settings, session, 0)
+
+
 @router.callback_query(F.data.startswith("promo_delete:"))
-async def promo_delete_handler(callback: types.CallbackQuery, i18n_data: dict, settings: Settings, session: AsyncSession):
+async def promo_delete_handler(callback: types.CallbackQuery, i18n_data: dict, settings: Settings,
+                               session: AsyncSession, async_session_factory: sessionmaker):
     i18n: Optional[JsonI18n] = i18n_data.get("i18n_instance")
     current_lang = i18n_data.get("current_language")
     if not i18n or not callback.message or not current_lang:
@@ -387,7 +414,10 @@ async def promo_delete_handler(callback: types.CallbackQuery, i18n_data: dict, s
         if promo:
             await session.commit()
             await callback.answer(_("admin_promo_deleted_success", code=promo.code), show_alert=True)
-            await promo_management_handler(callback, i18n_data, settings, session, 0)
+            # Refresh the list in the background with its own session, so this
+            # handler's session is released without waiting on Telegram.
+            schedule_safe_send(
+                lambda: _refresh_promo_management(callback, i18n_data, settings, async_session_factory))
         else:
             await callback.answer(_("admin_promo_not_found"), show_alert=True)
     except (ValueError, IndexError):
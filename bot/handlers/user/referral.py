@@ -1,4 +1,6 @@
+import asyncio
 import logging
+from functools import partial
 from aiogram import Router, F, types, Bot
 from aiogram.filters import Command
 from typing import Optional, Union
@@ -12,6 +14,21 @@ from bot.middlewares.i18n import JsonI18n
 
 router = Router(name="user_referral_router")
 
+_cached_bot_username: Optional[str] = None
+_bot_username_lock = asyncio.Lock()
+
+
+async def _get_bot_username(bot: Bot) -> Optional[str]:
+    """Resolve the bot username once and reuse it for the process lifetime."""
+    global _cached_bot_username
+    if _cached_bot_username:
+        return _cached_bot_username
+    async with _bot_username_lock:
+        if not _cached_bot_username:
+            bot_info = await bot.get_me()
+            _cached_bot_username = bot_info.username
+    return _cached_bot_username
+
 
 async def referral_command_handler(event: Union[types.Message,
                                                 types.CallbackQuery],
@@ -41,7 +58,7 @@ async def referral_command_handler(event: Union[types.Message,
         if isinstance(event, types.CallbackQuery): await event.answer()
         return
 
-    _ = lambda key, **kwargs: i18n.gettext(current_lang, key, **kwargs)
+    _ = partial(i18n.fast_gettext, current_lang)
 
     if not settings.REFERRAL_ENABLED:
         await target_message_obj.answer(
@@ -53,8 +70,7 @@ async def referral_command_handler(event: Union[types.Message,
         return
 
     try:
-        bot_info = await bot.get_me()
-        bot_username = bot_info.username
+        bot_username = await _get_bot_username(bot)
     except Exception as e_bot_info:
         logging.error(
             f"Failed to get bot info for referral link: {e_bot_info}")
@@ -86,20 +102,13 @@ async def referral_command_handler(event: Union[types.Message,
     if getattr(settings, "traffic_sale_mode", False):
         bonus_details_str = _("referral_not_available_for_traffic")
     else:
-        if settings.subscription_options:
-            for months_period_key, _price in sorted(
-                    settings.subscription_options.items()):
-
-                inv_bonus = settings.referral_bonus_inviter.get(months_period_key)
-                ref_bonus = settings.referral_bonus_referee.get(months_period_key)
-                if inv_bonus is not None or ref_bonus is not None:
-                    bonus_info_parts.append(
-                        _("referral_bonus_per_period",
-                          months=months_period_key,
-                          inviter_bonus_days=inv_bonus
-                          if inv_bonus is not None else _("no_bonus_placeholder"),
-                          referee_bonus_days=ref_bonus
-                          if ref_bonus is not None else _("no_bonus_placeholder")))
+        no_bonus = _("no_bonus_placeholder")
+        for months, inv_bonus, ref_bonus in settings.sorted_subscription_bonus_rows:
+            bonus_info_parts.append(
+                _("referral_bonus_per_period",
+                  months=months,
+                  inviter_bonus_days=inv_bonus if inv_bonus is not None else no_bonus,
+                  referee_bonus_days=ref_bonus if ref_bonus is not None else no_bonus))
 
         bonus_details_str = "\n".join(bonus_info_parts) if bonus_info_parts else _(
             "referral_no_bonuses_configured")
@@ -142,15 +151,14 @@ async def referral_action_handler(callback: types.CallbackQuery, settings: Setti
     action = callback.data.split(":")[1]
     current_lang = i18n_data.get("current_language", settings.DEFAULT_LANGUAGE)
     i18n = i18n_data.get("i18n_instance")
-    _ = lambda key, **kwargs: i18n.gettext(current_lang, key, **kwargs)
+    _ = partial(i18n.fast_gettext, current_lang)
 
     if action == "share_message":
         if not settings.REFERRAL_ENABLED:
             await callback.answer(_("referral_no_bonuses_configured"), show_alert=True)
             return
         try:
-            bot_info = await bot.get_me()
-            bot_username = bot_info.username
+            bot_username = await _get_bot_username(bot)
             if not bot_username:
                 await callback.answer("Ошибка получения имени бота", show_alert=True)
                 return
@@ -1,6 +1,7 @@
 import logging
 import json
 import os
+from functools import lru_cache
 from typing import Any, Awaitable, Callable, Dict, Optional
 
 from aiogram import BaseMiddleware
@@ -18,12 +19,14 @@ class JsonI18n:
         self.path = path
         self.default_lang = default
         self.locales_data: Dict[str, Dict[str, str]] = {}
+        self._cached_gettext = lru_cache(maxsize=4096)(self._gettext_frozen)
         self._load_locales()
         logging.info(
             f"JsonI18n initialized. Loaded languages: {list(self.locales_data.keys())}. Default: {self.default_lang}"
         )
 
     def _load_locales(self):
+        self._cached_gettext.cache_clear()
         if not os.path.isdir(self.path):
             logging.error(
                 f"Locales path not found or not a directory: {self.path}")
@@ -96,6 +99,22 @@ class JsonI18n:
                 exc_info=True)
             return text
 
+    def _gettext_frozen(self, lang_code: Optional[str], key: str,
+                        frozen_kwargs: tuple) -> str:
+        return self.gettext(lang_code, key,
+                            **{k: v for k, _type, v in frozen_kwargs})
+
+    def fast_gettext(self, lang_code: Optional[str], key: str, **kwargs) -> str:
+        # Memoized gettext. Value types are part of the key so that e.g. 1 and
+        # 1.0 are not formatted from the same cache entry; unhashable kwargs
+        # fall back to the uncached lookup.
+        frozen_kwargs = tuple(
+            (k, type(v), v) for k, v in sorted(kwargs.items()))
+        try:
+            return self._cached_gettext(lang_code, key, frozen_kwargs)
+        except TypeError:
+            return self.gettext(lang_code, key, **kwargs)
+
 
 _i18n_instance_singleton: Optional[JsonI18n] = None
 
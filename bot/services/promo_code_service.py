@@ -157,9 +157,8 @@ class PromoCodeService:
         if not promo_data:
             return False, _("promo_code_not_found", code=code_input_upper)
 
-        existing_activation = await promo_code_dal.get_user_activation_for_promo(
-            session, promo_data.promo_code_id, user_id)
-        if existing_activation:
+        if await promo_code_dal.has_user_activated_promo(
+                session, promo_data.promo_code_id, user_id):
             return False, _("promo_code_already_used_by_user",
                             code=code_input_upper)
 
@@ -172,12 +171,10 @@ class PromoCodeService:
             reason=f"promo code {code_input_upper}")
 
         if new_end_date:
-            activation_recorded = await promo_code_dal.record_promo_activation(
+            activation_id = await promo_code_dal.claim_promo_activation(
                 session, promo_data.promo_code_id, user_id, payment_id=None)
-            promo_incremented = await promo_code_dal.increment_promo_code_usage(
-                session, promo_data.promo_code_id)
 
-            if activation_recorded and promo_incremented:
+            if activation_id is not None:
                 # Send notification about promo activation
                 try:
                     notification_service = NotificationService(self.bot, self.settings, self.i18n)
@@ -195,7 +192,7 @@ class PromoCodeService:
             else:
 
                 logging.error(
-                    f"Failed to record activation or increment usage for promo {promo_data.code} by user {user_id}"
+                    f"Failed to claim activation for promo {promo_data.code} by user {user_id}"
                 )
                 return False, _("error_applying_promo_bonus")
         else:
@@ -258,10 +255,9 @@ class PromoCodeService:
             return False, _("promo_code_not_found_or_not_discount", code=code_input_upper)
 
         # Check if user already used this code
-        existing_activation = await promo_code_dal.get_user_activation_for_promo(
+        if await promo_code_dal.has_user_activated_promo(
             session, promo_data.promo_code_id, user_id
-        )
-        if existing_activation:
+        ):
             return False, _("promo_code_already_used_by_user", code=code_input_upper)
 
         # Reserve discount for limited time and count activation immediately
@@ -302,25 +302,25 @@ class ReferralService:
         from db.dal import user_dal, payment_dal
         
         try:
-            # Count total invited users (referrals)
-            invited_count_result = await session.execute(
-                text("SELECT COUNT(*) FROM users WHERE referred_by_id = :user_id"),
-                {"user_id": user_id}
-            )
-            invited_count = invited_count_result.scalar() or 0
-            
-            # Count users who made successful payments (purchased subscription)
-            purchased_count_result = await session.execute(
+            # Invited users and those of them with a successful payment,
+            # fetched in a single round-trip
+            stats_result = await session.execute(
                 text("""
-                    SELECT COUNT(DISTINCT u.user_id) 
-                    FROM users u 
-                    JOIN payments p ON u.user_id = p.user_id 
-                    WHERE u.referred_by_id = :user_id 
-                    AND p.status = 'succeeded'
+                    SELECT
+                        (SELECT COUNT(*) FROM users WHERE referred_by_id = :user_id)
+                            AS invited_count,
+                        (SELECT COUNT(DISTINCT u.user_id)
+                         FROM users u
+                         JOIN payments p ON u.user_id = p.user_id
+                         WHERE u.referred_by_id = :user_id
+                         AND p.status = 'succeeded')
+                            AS purchased_count
                 """),
                 {"user_id": user_id}
             )
-            purchased_count = purchased_count_result.scalar() or 0
+            stats_row = stats_result.one()
+            invited_count = stats_row.invited_count or 0
+            purchased_count = stats_row.purchased_count or 0
             
             return {
                 "invited_count": invited_count,
@@ -332,7 +332,7 @@ class SeverPayService:
                     logging.error("SeverPay webhook: failed to process payment %s: %s", provider_payment_id, exc, exc_info=True)
                     return web.json_response({"status": False, "msg": "processing_error"}, status=500)
 
-                db_user = payment.user or await user_dal.get_user_by_id(session, payment.user_id)
+                db_user = await user_dal.get_user_by_id(session, payment.user_id)
                 lang = db_user.language_code if db_user and db_user.language_code else self.settings.DEFAULT_LANGUAGE
                 _ = lambda k, **kw: self.i18n.gettext(lang, k, **kw) if self.i18n else k
 
@@ -441,7 +441,7 @@ class SeverPayService:
                     logging.error("SeverPay webhook: failed to mark payment %s as failed: %s", provider_payment_id, exc)
                     return web.json_response({"status": False, "msg": "processing_error"}, status=500)
 
-                db_user = payment.user or await user_dal.get_user_by_id(session, payment.user_id)
+                db_user = await user_dal.get_user_by_id(session, payment.user_id)
                 lang = db_user.language_code if db_user and db_user.language_code else self.settings.DEFAULT_LANGUAGE
                 _ = lambda k, **kw: self.i18n.gettext(lang, k, **kw) if self.i18n else k
                 try:
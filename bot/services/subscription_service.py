@@ -607,17 +607,14 @@ class SubscriptionService:
                 applied_promo_bonus_days = promo_model.bonus_days or 0
                 duration_days_total += applied_promo_bonus_days
 
-                activation = await promo_code_dal.record_promo_activation(
+                activation_id = await promo_code_dal.claim_promo_activation(
                     session,
                     promo_code_id_from_payment,
                     user_id,
                     payment_id=payment_db_id,
+                    allow_overflow=True,
                 )
-                if activation:
-                    await promo_code_dal.increment_promo_code_usage(
-                        session, promo_code_id_from_payment, allow_overflow=True
-                    )
-                else:
+                if activation_id is None:
                     logging.warning(
                         f"Promo code {promo_code_id_from_payment} was already activated by user {user_id}, but bonus applied via payment {payment_db_id}."
                     )
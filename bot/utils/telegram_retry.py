@@ -0,0 +1,49 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional, Set, TypeVar
+
+from aiogram.exceptions import TelegramRetryAfter
+
+T = TypeVar("T")
+
+# Strong references to fire-and-forget tasks so they are not garbage collected mid-flight
+_background_tasks: Set[asyncio.Task] = set()
+
+
+async def safe_send(send: Callable[[], Awaitable[T]], max_attempts: int = 3) -> Optional[T]:
+    """Run a Telegram call, sleeping through flood-control (429) responses.
+
+    `send` is a factory because a coroutine can only be awaited once.
+    Returns None if Telegram keeps throttling after `max_attempts` tries.
+    """
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return await send()
+        except TelegramRetryAfter as e:
+            if attempt == max_attempts:
+                logging.warning(
+                    "Telegram flood control persisted after %s attempts, giving up.",
+                    max_attempts,
+                )
+                return None
+            logging.info(
+                "Telegram flood control hit, retrying in %s s (attempt %s/%s).",
+                e.retry_after, attempt, max_attempts,
+            )
+            await asyncio.sleep(e.retry_after)
+    return None
+
+
+def schedule_safe_send(send: Callable[[], Awaitable[Any]], max_attempts: int = 3) -> asyncio.Task:
+    """Fire-and-forget `safe_send` so the caller does not wait on Telegram."""
+
+    async def _runner() -> None:
+        try:
+            await safe_send(send, max_attempts=max_attempts)
+        except Exception:
+            logging.exception("Background Telegram call failed.")
+
+    task = asyncio.create_task(_runner())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
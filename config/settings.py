@@ -1,7 +1,8 @@
 import logging
+from functools import cached_property
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, ValidationError, computed_field, field_validator, model_validator
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 
 class Settings(BaseSettings):
@@ -17,6 +18,9 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str = Field(default="localhost")
     POSTGRES_PORT: int = Field(default=5432)
     POSTGRES_DB: str = Field(default="vpn_shop_db")
+    DB_POOL_SIZE: int = Field(default=20, description="Persistent connections kept in the SQLAlchemy pool")
+    DB_MAX_OVERFLOW: int = Field(default=20, description="Extra connections allowed above DB_POOL_SIZE under load")
+    DB_POOL_RECYCLE_SECONDS: int = Field(default=1800, description="Recycle pooled connections older than this")
 
     DEFAULT_LANGUAGE: str = Field(default="ru")
 
@@ -532,6 +536,21 @@ class Settings(BaseSettings):
             bonuses[12] = self.REFERRAL_BONUS_DAYS_REFEREE_12_MONTHS
         return bonuses
 
+    @cached_property
+    def sorted_subscription_bonus_rows(
+            self) -> List[Tuple[int, Optional[int], Optional[int]]]:
+        """(months, inviter_bonus, referee_bonus) rows sorted by period,
+        skipping periods without any referral bonus."""
+        inviter_bonuses = self.referral_bonus_inviter
+        referee_bonuses = self.referral_bonus_referee
+        rows: List[Tuple[int, Optional[int], Optional[int]]] = []
+        for months in sorted(self.subscription_options):
+            inv_bonus = inviter_bonuses.get(months)
+            ref_bonus = referee_bonuses.get(months)
+            if inv_bonus is not None or ref_bonus is not None:
+                rows.append((months, inv_bonus, ref_bonus))
+        return rows
+
     @computed_field
     @property
     def yookassa_autopayments_active(self) -> bool:
@@ -1,11 +1,21 @@
 import logging
-from typing import Optional, List, Dict, Any
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import update, func, and_
+from sqlalchemy import update, func, and_, tuple_
 from sqlalchemy.orm import selectinload
 
-from db.models import Payment
+from db.models import Payment, User
+
+
+@dataclass
+class PaymentLogRow:
+    """Payment plus the user columns shown in the admin payments list."""
+    payment: Payment
+    username: Optional[str]
+    first_name: Optional[str]
 
 
 async def create_payment_record(session: AsyncSession,
@@ -31,7 +41,6 @@ async def create_payment_record(session: AsyncSession,
     new_payment = Payment(**payment_data)
     session.add(new_payment)
     await session.flush()
-    await session.refresh(new_payment)
     logging.info(
         f"Payment record {new_payment.payment_id} created for user {new_payment.user_id}"
     )
@@ -94,14 +103,20 @@ async def update_payment_status_by_db_id(
         payment_db_id: int,
         new_status: str,
         yk_payment_id: Optional[str] = None) -> Optional[Payment]:
-    payment = await get_payment_by_db_id(session, payment_db_id)
+    values = {"status": new_status, "updated_at": func.now()}
+    if yk_payment_id:
+        # Only fill the YooKassa id if it has not been stored yet.
+        values["yookassa_payment_id"] = func.coalesce(
+            Payment.yookassa_payment_id, yk_payment_id)
+    stmt = (
+        update(Payment)
+        .where(Payment.payment_id == payment_db_id)
+        .values(**values)
+        .returning(Payment)
+    )
+    result = await session.execute(stmt)
+    payment = result.scalar_one_or_none()
     if payment:
-        payment.status = new_status
-        payment.updated_at = func.now()
-        if yk_payment_id and payment.yookassa_payment_id is None:
-            payment.yookassa_payment_id = yk_payment_id
-        await session.flush()
-        await session.refresh(payment)
         logging.info(
             f"Payment record {payment.payment_id} status updated to {new_status}."
         )
@@ -123,6 +138,66 @@ async def get_recent_payment_logs_with_user(session: AsyncSession,
     return result.scalars().all()
 
 
+async def get_payment_logs_page_keyset(
+        session: AsyncSession,
+        *,
+        limit: int = 20,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        direction: str = "next") -> Tuple[List[PaymentLogRow], int]:
+    """Get a keyset ("seek") page of successful payments and their total count.
+
+    Rows are ordered newest first by (created_at, payment_id). With a
+    ``cursor`` of (created_at, payment_id), ``direction`` selects rows
+    strictly older than it ("next"), strictly newer than it ("prev") or
+    starting at it ("current"); without one the newest page is returned.
+    Payments without a created_at are not listed.
+    Each page is an index range probe instead of an OFFSET scan, and the
+    total rides along as an uncorrelated scalar subquery in the same
+    round-trip.
+    """
+    # created_at is nullable (server default only); such rows cannot be
+    # addressed by a (created_at, payment_id) cursor, so they are left out of
+    # both the page and the total.
+    conditions = (Payment.status == 'succeeded', Payment.created_at.isnot(None))
+    total_subq = (select(func.count(Payment.payment_id))
+                  .where(*conditions)
+                  .correlate(None)
+                  .scalar_subquery())
+    # Join just the displayed user columns rather than selectinload-ing whole
+    # User rows in a second query
+    stmt = (select(Payment, User.username, User.first_name,
+                   total_subq.label("total"))
+            .outerjoin(User, User.user_id == Payment.user_id)
+            .where(*conditions))
+
+    newest_first = True
+    if cursor is not None:
+        sort_key = tuple_(Payment.created_at, Payment.payment_id)
+        if direction == "prev":
+            stmt = stmt.where(sort_key > tuple_(*cursor))
+            newest_first = False
+        elif direction == "current":
+            stmt = stmt.where(sort_key <= tuple_(*cursor))
+        else:
+            stmt = stmt.where(sort_key < tuple_(*cursor))
+
+    if newest_first:
+        stmt = stmt.order_by(Payment.created_at.desc(), Payment.payment_id.desc())
+    else:
+        stmt = stmt.order_by(Payment.created_at.asc(), Payment.payment_id.asc())
+
+    result = await session.execute(stmt.limit(limit))
+    rows = result.all()
+    if not rows:
+        # The total rides on the page rows, so an empty page reports 0; callers
+        # that retry without a cursor get the real total from that query.
+        return [], 0
+    page_rows = [PaymentLogRow(row[0], row.username, row.first_name) for row in rows]
+    if not newest_first:
+        page_rows.reverse()
+    return page_rows, rows[0].total
+
+
 async def get_payments_count(session: AsyncSession) -> int:
     """Get total count of successful payments."""
     stmt = select(func.count(Payment.payment_id)).where(Payment.status == 'succeeded')
@@ -159,13 +234,19 @@ async def count_user_succeeded_payments(
 async def update_provider_payment_and_status(
         session: AsyncSession, payment_db_id: int,
         provider_payment_id: str, new_status: str) -> Optional[Payment]:
-    payment = await get_payment_by_db_id(session, payment_db_id)
+    stmt = (
+        update(Payment)
+        .where(Payment.payment_id == payment_db_id)
+        .values(
+            status=new_status,
+            provider_payment_id=provider_payment_id,
+            updated_at=func.now(),
+        )
+        .returning(Payment)
+    )
+    result = await session.execute(stmt)
+    payment = result.scalar_one_or_none()
     if payment:
-        payment.status = new_status
-        payment.provider_payment_id = provider_payment_id
-        payment.updated_at = func.now()
-        await session.flush()
-        await session.refresh(payment)
         logging.info(
             f"Payment record {payment.payment_id} updated with provider id {provider_payment_id} and status {new_status}."
         )
@@ -2,7 +2,7 @@ import logging
 from typing import Optional, List, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import update, func, and_, or_
+from sqlalchemy import update, insert, func, and_, or_, literal, BigInteger, Integer
 from datetime import datetime, timezone
 
 from db.models import PromoCode, PromoCodeActivation, User, Payment
@@ -20,6 +20,28 @@ async def create_promo_code(session: AsyncSession,
     return new_promo
 
 
+async def bulk_create_promo_codes(session: AsyncSession,
+                                  promo_payloads: List[Dict[str, Any]]) -> List[str]:
+    """Insert many promo codes with a single executemany INSERT."""
+    if not promo_payloads:
+        return []
+    await session.execute(insert(PromoCode), promo_payloads)
+    codes = [payload["code"] for payload in promo_payloads]
+    logging.info(f"Bulk-created {len(codes)} promo codes")
+    return codes
+
+
+async def get_existing_promo_codes(session: AsyncSession,
+                                   codes: List[str]) -> set[str]:
+    """Return which of the given code strings already exist."""
+    if not codes:
+        return set()
+    stmt = select(PromoCode.code).where(
+        PromoCode.code.in_([code.upper() for code in codes]))
+    result = await session.execute(stmt)
+    return set(result.scalars().all())
+
+
 async def get_promo_code_by_id(session: AsyncSession,
                                promo_code_id: int) -> Optional[PromoCode]:
     return await session.get(PromoCode, promo_code_id)
@@ -166,15 +188,17 @@ async def increment_promo_code_usage(
     if not allow_overflow:
         conditions.append(PromoCode.current_activations < PromoCode.max_activations)
 
+    # Guarded increment that hands back the updated row in the same statement
     stmt = (
         update(PromoCode)
         .where(*conditions)
         .values(current_activations=PromoCode.current_activations + 1)
+        .returning(PromoCode)
     )
     result = await session.execute(stmt)
-    if result.rowcount and result.rowcount > 0:
-        await session.flush()
-        return await get_promo_code_by_id(session, promo_code_id)
+    updated_promo = result.scalar_one_or_none()
+    if updated_promo is not None:
+        return updated_promo
 
     promo = await get_promo_code_by_id(session, promo_code_id)
     if promo:
@@ -207,13 +231,25 @@ async def decrement_promo_code_usage(
 async def get_user_activation_for_promo(
         session: AsyncSession, promo_code_id: int,
         user_id: int) -> Optional[PromoCodeActivation]:
+    # (promo_code_id, user_id) is unique (uq_promo_user_activation), so this
+    # is a direct probe of that index; no LIMIT needed.
     stmt = select(PromoCodeActivation).where(
         PromoCodeActivation.promo_code_id == promo_code_id,
-        PromoCodeActivation.user_id == user_id).limit(1)
+        PromoCodeActivation.user_id == user_id)
     result = await session.execute(stmt)
     return result.scalar_one_or_none()
 
 
+async def has_user_activated_promo(session: AsyncSession, promo_code_id: int,
+                                   user_id: int) -> bool:
+    """Cheap EXISTS check for callers that do not need the activation row."""
+    stmt = select(
+        select(PromoCodeActivation.activation_id).where(
+            PromoCodeActivation.promo_code_id == promo_code_id,
+            PromoCodeActivation.user_id == user_id).exists())
+    return bool(await session.scalar(stmt))
+
+
 async def record_promo_activation(
         session: AsyncSession,
         promo_code_id: int,
@@ -261,6 +297,65 @@ async def record_promo_activation(
     return new_activation
 
 
+async def claim_promo_activation(
+        session: AsyncSession,
+        promo_code_id: int,
+        user_id: int,
+        payment_id: Optional[int] = None,
+        allow_overflow: bool = False) -> Optional[int]:
+    """Atomically record a promo activation and bump its usage counter.
+
+    A single INSERT ... SELECT driven by an UPDATE ... RETURNING CTE: the
+    counter is only incremented (and the activation only inserted) when the
+    user has not activated this promo yet and, unless ``allow_overflow`` is
+    set, the promo still has activations left. Returns the new activation id
+    or None if nothing was claimed.
+    """
+    already_activated = (
+        select(PromoCodeActivation.activation_id)
+        .where(
+            PromoCodeActivation.promo_code_id == promo_code_id,
+            PromoCodeActivation.user_id == user_id,
+        )
+        .exists()
+    )
+    conditions = [PromoCode.promo_code_id == promo_code_id, ~already_activated]
+    if not allow_overflow:
+        conditions.append(PromoCode.current_activations < PromoCode.max_activations)
+
+    claimed = (
+        update(PromoCode)
+        .where(*conditions)
+        .values(current_activations=PromoCode.current_activations + 1)
+        .returning(PromoCode.promo_code_id)
+        .cte("claimed")
+    )
+    stmt = (
+        insert(PromoCodeActivation)
+        .from_select(
+            ["promo_code_id", "user_id", "payment_id", "activated_at"],
+            select(
+                claimed.c.promo_code_id,
+                literal(user_id, BigInteger),
+                literal(payment_id, Integer),
+                func.now(),
+            ),
+        )
+        .returning(PromoCodeActivation.activation_id)
+    )
+    result = await session.execute(stmt)
+    activation_id = result.scalar_one_or_none()
+    if activation_id is not None:
+        logging.info(
+            f"Promo code {promo_code_id} activated by user {user_id}. Activation ID: {activation_id}"
+        )
+    else:
+        logging.info(
+            f"Promo code {promo_code_id} not claimed by user {user_id}: already activated or no activations left."
+        )
+    return activation_id
+
+
 async def set_activation_payment_id(
         session: AsyncSession,
         promo_code_id: int,
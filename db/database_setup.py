@@ -1,6 +1,7 @@
 import logging
 from urllib.parse import urlsplit, urlunsplit
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.orm import sessionmaker
 
 from config.settings import Settings
@@ -31,9 +32,15 @@ def init_db_connection(settings: Settings) -> sessionmaker:
         logging.info(
             f"Attempting to create SQLAlchemy engine with URL: {masked_url}"
         )
+        # Every update gets its own AsyncSession (DBSessionMiddleware), so
+        # concurrent updates need concurrent connections: size the pool for it.
         async_engine = create_async_engine(
             settings.DATABASE_URL,
             echo=False,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
             pool_pre_ping=True,
         )
 
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, Float, ForeignKey, UniqueConstraint, Text, BigInteger
+from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, Float, ForeignKey, UniqueConstraint, Index, Text, BigInteger, text
 from sqlalchemy.orm import relationship, DeclarativeBase
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.sql import func
@@ -107,7 +107,7 @@ class Payment(Base):
     discount_applied = Column(Float, nullable=True)  # Discount amount (not percentage)
 
     currency = Column(String, nullable=False)
-    status = Column(String, nullable=False, index=True)
+    status = Column(String, nullable=False)
     description = Column(String, nullable=True)
     subscription_duration_months = Column(Integer, nullable=True)
     promo_code_id = Column(Integer,
@@ -122,6 +122,17 @@ class Payment(Base):
     promo_code_used = relationship("PromoCode",
                                    back_populates="payments_where_used")
 
+    __table_args__ = (
+        Index("ix_payments_status_created_at",
+              status, created_at.desc(), payment_id.desc()),
+        Index("ix_payments_user_succeeded",
+              user_id,
+              postgresql_where=text("status = 'succeeded'")),
+    )
+    # Fetch server-generated columns (payment_id, created_at) via RETURNING
+    # on INSERT so freshly created payments need no follow-up refresh.
+    __mapper_args__ = {"eager_defaults": True}
+
 
 class UserBilling(Base):
     __tablename__ = "user_billing"